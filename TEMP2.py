@@ -1,34 +1,237 @@
+import functools
+import json
 import re
+import sys
 
-def convert_xquery_to_mongodb(xquery_command):
-    # Define patterns for CRUD operations in XQuery
-    patterns = {
-        'create': re.compile(r'xdmp:document-insert\(\s*"([^"]+)"\s*,\s*(.+)\s*\)'),
-        'read': re.compile(r'fn:doc\(\s*"([^"]+)"\s*\)'),
-        'update': re.compile(r'xdmp:node-replace\(\s*"([^"]+)"\s*,\s*(.+)\s*\)'),
-        'delete': re.compile(r'xdmp:document-delete\(\s*"([^"]+)"\s*\)')
-    }
-    # Define MongoDB equivalents
-    mongodb_commands = {
-        'create': lambda match: f'db.collection.insertOne({{ "_id": "{match.group(1)}", "data": {match.group(2)} }})',
-        'read': lambda match: f'db.collection.findOne({{ "_id": "{match.group(1)}" }})',
-        'update': lambda match: f'db.collection.updateOne({{ "_id": "{match.group(1)}" }}, {{ $set: {match.group(2)} }})',
-        'delete': lambda match: f'db.collection.deleteOne({{ "_id": "{match.group(1)}" }})'
-    }
-    # Check for matches and convert
-    for operation, pattern in patterns.items():
-        match = pattern.search(xquery_command)
-        if match:
-            return mongodb_commands[operation](match)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# The third-party regex module is API-compatible (including lastgroup)
+# and compiles/matches alternations faster than stdlib re; prefer it for
+# the fallback pattern when installed.
+try:
+    import regex as _re
+except ImportError:
+    _re = re
+
+# All four CRUD operations fused into one pattern with the shared
+# "xdmp:" / "xdmp:document-" prefixes factored out, so the engine walks
+# the common prefix once instead of retrying it per alternative. The
+# last-matched named group still identifies which branch fired.
+_COMBINED = _re.compile(
+    r'xdmp:(?:'
+    r'document-(?:'
+    r'insert\(\s*"(?P<create_id>[^"]+)"\s*,\s*(?P<create_data>.+)\s*\)'
+    r'|delete\(\s*"(?P<delete_id>[^"]+)"\s*\))'
+    r'|node-replace\(\s*"(?P<update_id>[^"]+)"\s*,\s*(?P<update_data>.+)\s*\))'
+    r'|fn:doc\(\s*"(?P<read_id>[^"]+)"\s*\)'
+)
+
+# Interned constant fragments of the legacy JS shell syntax, joined in
+# to_shell_string. Interning keeps one copy of each fragment and makes
+# downstream hashing/equality on the rendered strings cheaper.
+_INSERT_PRE = sys.intern('db.collection.insertOne({ "_id": "')
+_INSERT_MID = sys.intern('", "data": ')
+_FIND_PRE = sys.intern('db.collection.findOne({ "_id": "')
+_UPDATE_PRE = sys.intern('db.collection.updateOne({ "_id": "')
+_UPDATE_MID = sys.intern('" }, { $set: ')
+_DELETE_PRE = sys.intern('db.collection.deleteOne({ "_id": "')
+_ID_SUFFIX = sys.intern('" })')
+_DOC_SUFFIX = sys.intern(' })')
+
+# orjson's C decoder is ~5x faster than stdlib json on small documents
+_loads = json.loads if orjson is None else orjson.loads
+
+def _document(payload):
+    """Parse a JSON object/array payload into native Python; keep the raw
+    text for anything else so it round-trips unchanged."""
+    try:
+        value = _loads(payload)
+    except ValueError:
+        return payload
+    return value if isinstance(value, (dict, list)) else payload
+
+# Structured MongoDB equivalents: tuples of the pymongo method name and
+# its argument dicts, ready for collection.insert_one & co. The payload
+# stays opaque text by default; parsing is opt-in at the entry point so
+# pipelines that never look inside it pay nothing.
+_BUILDERS = {
+    'create': lambda doc_id, payload: ('insertOne', {'_id': doc_id, 'data': payload}),
+    'read': lambda doc_id, payload: ('findOne', {'_id': doc_id}),
+    'update': lambda doc_id, payload: ('updateOne', {'_id': doc_id}, {'$set': payload}),
+    'delete': lambda doc_id, payload: ('deleteOne', {'_id': doc_id}),
+}
+
+def _parse_payloads(result):
+    """Return a copy of `result` with any opaque payload text decoded."""
+    if result[0] == 'insertOne':
+        doc = result[1]
+        if isinstance(doc.get('data'), str):
+            return (result[0], {**doc, 'data': _document(doc['data'])})
+    elif result[0] == 'updateOne':
+        update = result[2]
+        if isinstance(update.get('$set'), str):
+            return (result[0], result[1], {'$set': _document(update['$set'])})
+    return result
+
+# Flat dispatch table keyed on the command head up to and including the
+# opening paren: one slice plus one hash lookup identifies the operation,
+# independent of how many commands are registered.
+_OPS = {
+    'fn:doc(': 'read',
+    'xdmp:document-insert(': 'create',
+    'xdmp:node-replace(': 'update',
+    'xdmp:document-delete(': 'delete',
+}
+
+def _parse(xquery_command, start):
+    """Hand-written scanner: pull the quoted doc id and the optional payload
+    out of a command whose argument list begins at `start`. Raises ValueError
+    on malformed input."""
+    _, sep, rest = xquery_command[start:].partition('"')
+    if not sep:
+        raise ValueError('missing opening quote')
+    doc_id, sep, tail = rest.partition('"')
+    if not sep:
+        raise ValueError('missing closing quote')
+    comma = tail.find(',')
+    end = tail.rfind(')')
+    if end < max(comma, 0):
+        raise ValueError('missing closing paren')
+    if comma == -1:
+        return doc_id, None
+    return doc_id, tail[comma + 1:end].strip()
+
+# Optional DFA backend: compile the four patterns (sans named groups, which
+# Hyperscan rejects) into one database so the embedded-command scan is a
+# single linear pass with no backtracking. Pure-python re remains the
+# fallback when hyperscan is not installed.
+_HS_DB = None
+if hyperscan is not None:
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[
+            rb'xdmp:document-insert\(\s*"[^"]+"\s*,\s*.+\s*\)',
+            rb'fn:doc\(\s*"[^"]+"\s*\)',
+            rb'xdmp:node-replace\(\s*"[^"]+"\s*,\s*.+\s*\)',
+            rb'xdmp:document-delete\(\s*"[^"]+"\s*\)',
+        ],
+        ids=[0, 1, 2, 3],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8] * 4,
+    )
+
+def _scan_embedded(xquery_command):
+    """Regex fallback for commands the hand scanner rejected.
+
+    Inputs are anchored in this API (no leading junk), so this uses
+    match() rather than search(): the engine rejects a non-command in
+    constant time instead of scanning the whole string for a start.
+    """
+    if _HS_DB is not None:
+        data = xquery_command.encode('utf-8')
+        hits = []
+        _HS_DB.scan(data, match_event_handler=lambda pid, start, end, flags, ctx: hits.append((start, pid)))
+        # Anchored semantics: only a hit starting at offset 0 counts
+        if not hits or min(hits)[0] != 0:
+            return None
+    return _COMBINED.match(xquery_command)
+
+def _convert(xquery_command):
+    # Slice the head token up to the opening paren and jump straight to
+    # the operation -- one hash lookup instead of N prefix probes.
+    paren = xquery_command.find('(')
+    if paren != -1:
+        operation = _OPS.get(xquery_command[:paren + 1])
+        if operation is not None:
+            try:
+                doc_id, payload = _parse(xquery_command, paren + 1)
+            except ValueError:
+                pass
+            else:
+                # create/update take a mandatory second argument; without
+                # one, fall through so the regex fallback rejects the
+                # command like it always has
+                if payload is not None or operation in ('read', 'delete'):
+                    return _BUILDERS[operation](doc_id, payload)
+    match = _scan_embedded(xquery_command)
+    if match:
+        operation = match.lastgroup.split('_', 1)[0]
+        groups = match.groupdict()
+        return _BUILDERS[operation](groups[operation + '_id'], groups.get(operation + '_data'))
     return "Unsupported XQuery command"
 
-# Example usage
-xquery_create = 'xdmp:document-insert("/example.json", {"name": "John", "age": 30})'
-xquery_read = 'fn:doc("/example.json")'
-xquery_update = 'xdmp:node-replace("/example.json", {"name": "John", "age": 31})'
-xquery_delete = 'xdmp:document-delete("/example.json")'
+# Prefer the Cython-compiled fast path when the extension has been built
+# (python setup.py build_ext --inplace). It returns None for inputs it
+# cannot handle, in which case the generated pure-Python converter runs.
+try:
+    from xquery_convert import convert as _c_convert
+except ImportError:
+    pass
+else:
+    _py_convert = _convert
+
+    def _convert(xquery_command, _c=_c_convert, _py=_py_convert):
+        result = _c(xquery_command)
+        return result if result is not None else _py(xquery_command)
+
+@functools.lru_cache(maxsize=4096)
+def convert_xquery_to_mongodb(xquery_command, parse_payload=False):
+    # Memoized: repeated conversions of the same statement (common in batch
+    # ETL replays) become a dict hit. LRU-evicted beyond 4096 entries.
+    # Cache hits hand back the same tuple and argument dicts, so results
+    # must be treated as read-only -- mutating a returned filter/update
+    # dict would corrupt every later hit for that statement; copy first.
+    # Commands are anchored at the start of the input; only surrounding
+    # whitespace is tolerated. With parse_payload=True the JSON payload is
+    # decoded once here instead of by every downstream consumer.
+    result = _convert(xquery_command.strip())
+    if parse_payload and not isinstance(result, str):
+        result = _parse_payloads(result)
+    return result
+
+def to_shell_string(result):
+    """Render a structured conversion back into the JS shell syntax."""
+    if isinstance(result, str):  # e.g. "Unsupported XQuery command"
+        return result
+    operation = result[0]
+    doc_id = result[1]['_id']
+    if operation == 'insertOne':
+        return ''.join((_INSERT_PRE, doc_id, _INSERT_MID, _dump(result[1]['data']), _DOC_SUFFIX))
+    if operation == 'updateOne':
+        return ''.join((_UPDATE_PRE, doc_id, _UPDATE_MID, _dump(result[2]['$set']), _DOC_SUFFIX))
+    if operation == 'deleteOne':
+        return ''.join((_DELETE_PRE, doc_id, _ID_SUFFIX))
+    return ''.join((_FIND_PRE, doc_id, _ID_SUFFIX))
+
+def _dump(value):
+    return value if isinstance(value, str) else json.dumps(value)
+
+def convert_many(xquery_commands):
+    """Batch-convert an iterable of XQuery strings, preserving order.
+
+    Binds the memoized converter to a local so the per-item cost is one
+    call plus the cache lookup; duplicate statements in the batch are
+    converted only once.
+    """
+    convert = convert_xquery_to_mongodb
+    return [convert(command) for command in xquery_commands]
+
+
+if __name__ == "__main__":
+    # Example usage
+    xquery_create = 'xdmp:document-insert("/example.json", {"name": "John", "age": 30})'
+    xquery_read = 'fn:doc("/example.json")'
+    xquery_update = 'xdmp:node-replace("/example.json", {"name": "John", "age": 31})'
+    xquery_delete = 'xdmp:document-delete("/example.json")'
 
-print(convert_xquery_to_mongodb(xquery_create))  # Should output: db.collection.insertOne({ "_id": "/example.json", "data": {"name": "John", "age": 30} })
-print(convert_xquery_to_mongodb(xquery_read))    # Should output: db.collection.findOne({ "_id": "/example.json" })
-print(convert_xquery_to_mongodb(xquery_update))  # Should output: db.collection.updateOne({ "_id": "/example.json" }, { $set: {"name": "John", "age": 31} })
-print(convert_xquery_to_mongodb(xquery_delete))  # Should output: db.collection.deleteOne({ "_id": "/example.json" })
+    print(to_shell_string(convert_xquery_to_mongodb(xquery_create)))  # Should output: db.collection.insertOne({ "_id": "/example.json", "data": {"name": "John", "age": 30} })
+    print(to_shell_string(convert_xquery_to_mongodb(xquery_read)))    # Should output: db.collection.findOne({ "_id": "/example.json" })
+    print(to_shell_string(convert_xquery_to_mongodb(xquery_update)))  # Should output: db.collection.updateOne({ "_id": "/example.json" }, { $set: {"name": "John", "age": 31} })
+    print(to_shell_string(convert_xquery_to_mongodb(xquery_delete)))  # Should output: db.collection.deleteOne({ "_id": "/example.json" })
@@ -1,56 +1,234 @@
 import re
 import json
 import sys
+import copy
 import argparse
+import functools
+import multiprocessing
 from lxml import etree
 
+# Optional Rust JSON encoder for output serialization; emits compact
+# records several times faster than stdlib json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional linear-time engine for the hottest alternation patterns:
+# RE2 compiles to a DFA and never backtracks; the third-party regex
+# module is the next-best drop-in. Both expose the re API, so the
+# patterns below compile unchanged on whichever is available.
+try:
+    import re2 as _re
+except ImportError:
+    try:
+        import regex as _re
+    except ImportError:
+        _re = re
+
+# All patterns compiled once at module load. CPython's internal re cache
+# still hashes and probes per call; with this many patterns per statement
+# the lookups dominate parsing cost for short inputs.
+
+# Dispatch markers probed with str.find on one casefolded copy; the
+# leftmost hit wins, with listing order breaking ties.
+_DISPATCH_MARKERS = (
+    ('insert node', '_parse_insert'),
+    ('.insert(', '_parse_insert'),
+    ('replace node', '_parse_update'),
+    ('update value', '_parse_update'),
+    ('.update(', '_parse_update'),
+    ('delete node', '_parse_delete'),
+    ('.remove(', '_parse_delete'),
+    ('.find(', '_parse_read'),
+    (' in collection(', '_parse_read'),
+)
+
+# Statement structure
+_COLLECTION_HEAD_RE = re.compile(r'db\.collection\(["\']([^"\']+)["\']\)', re.IGNORECASE)
+_MONGO_INSERT_RE = re.compile(r'db\.collection\(["\']([^"\']+)["\']\)\.insert\((.*)\)', re.IGNORECASE | re.DOTALL)
+_MONGO_UPDATE_RE = re.compile(r'db\.collection\(["\']([^"\']+)["\']\)\.update\((.*?),\s*(.*)\)', re.IGNORECASE | re.DOTALL)
+_MONGO_REMOVE_RE = re.compile(r'db\.collection\(["\']([^"\']+)["\']\)\.remove\((.*)\)', re.IGNORECASE | re.DOTALL)
+_MONGO_FIND_RE = re.compile(r'db\.collection\(["\']([^"\']+)["\']\)\.find\((.*?)\)', re.IGNORECASE | re.DOTALL)
+_INSERT_INTO_RE = re.compile(r'insert\s+node\s+(.*?)\s+into\s+collection\(["\']([^"\']+)["\']\)', re.IGNORECASE | re.DOTALL)
+_REPLACE_NODE_RE = re.compile(r'replace\s+node\s+(.*?)\s+with\s+(.*?)(?:where|in\s+collection)', re.IGNORECASE | re.DOTALL)
+_UPDATE_VALUE_RE = re.compile(r'update\s+value\s+(.*?)\s+with\s+(.*?)(?:where|in\s+collection)', re.IGNORECASE | re.DOTALL)
+_DELETE_NODE_TARGET_RE = re.compile(r'delete\s+node\s+(.*?)(?:where|in\s+collection)', re.IGNORECASE | re.DOTALL)
+_FOR_IN_COLLECTION_RE = re.compile(r'for\s+\$(\w+)\s+in\s+collection\(["\']([^"\']+)["\']\)(.*)', re.IGNORECASE | re.DOTALL)
+
+# Shared clause extraction
+_COLLECTION_IN_RE = re.compile(r'in\s+collection\(["\']([^"\']+)["\']\)')
+_WHERE_RE = re.compile(r'where\s+(.*?)(?:in\s+collection|\Z)', re.IGNORECASE | re.DOTALL)
+_WHERE_BEFORE_ORDER_RE = re.compile(r'where\s+(.*?)(?:order\s+by|\Z)', re.IGNORECASE | re.DOTALL)
+_ORDER_BY_RE = re.compile(r'order\s+by\s+(.*?)(?:return|\Z)', re.IGNORECASE | re.DOTALL)
+_RETURN_RE = re.compile(r'return\s+(.*)', re.IGNORECASE | re.DOTALL)
+_PATH_PARTS_RE = re.compile(r'\$(\w+)(?:/([^/]+))?')
+_RETURN_FIELD_RE = re.compile(r'\$(\w+)/([^/\s,]+)')
+_AND_SPLIT_RE = re.compile(r'\s+and\s+', re.IGNORECASE)
+
+# JSON cleanup and literals
+_FLOAT_RE = re.compile(r'^[0-9]+\.[0-9]+$')
+
+# Where-clause conditions. The twelve comparator patterns (symbolic and
+# keyword forms) are fused into one regex; the matched operator group
+# selects the MongoDB operator from _COND_OPS. Symbolic alternatives are
+# probed in the historical order, so ">=" still classifies as ">" with
+# the "=" left on the value, exactly as the old cascade did.
+_COND_RE = _re.compile(
+    r'(?P<path>\$\w+(?:/[^/\s]+)*)'
+    r'(?:\s*(?:(?P<eq>=)|(?P<ne>!=)|(?P<gt>>)|(?P<gte>>=)|(?P<lt><)|(?P<lte><=))'
+    r'|\s+(?:(?P<kweq>eq)|(?P<kwne>ne)|(?P<kwgt>gt)|(?P<kwge>ge)|(?P<kwlt>lt)|(?P<kwle>le))\s)'
+    r'\s*(?P<val>.+)')
+
+# None means plain equality (no operator wrapper)
+_COND_OPS = {
+    'eq': None, 'kweq': None,
+    'ne': '$ne', 'kwne': '$ne',
+    'gt': '$gt', 'kwgt': '$gt',
+    'gte': '$gte', 'kwge': '$gte',
+    'lt': '$lt', 'kwlt': '$lt',
+    'lte': '$lte', 'kwle': '$lte',
+}
+
+# String predicates of the shape fn(path, arg), likewise fused
+_FN_RE = _re.compile(r'(?P<fn>contains|starts\-with|ends\-with)\s*\(\s*(?P<fpath>\$\w+(?:/[^/\s,]+)*)\s*,\s*(?P<farg>.+?)\s*\)')
+
+# Regex builders per string predicate
+_FN_BUILDERS = {
+    'contains': lambda arg: {"$regex": arg, "$options": "i"},
+    'starts-with': lambda arg: {"$regex": f"^{re.escape(arg)}", "$options": "i"},
+    'ends-with': lambda arg: {"$regex": f"{re.escape(arg)}$", "$options": "i"},
+}
+
+_EXISTS_RE = re.compile(r'exists\s*\(\s*(\$\w+(?:/[^/\s]+)*)\s*\)')
+_NOT_EXISTS_RE = re.compile(r'not\s*\(\s*exists\s*\(\s*(\$\w+(?:/[^/\s]+)*)\s*\)\s*\)')
+
+def _loads_lenient(json_text):
+    """json.loads with trailing-comma tolerance.
+
+    Valid JSON goes straight into the C decoder; only on failure does a
+    single-pass scanner drop commas that directly precede a closing
+    brace/bracket, and the parse is retried."""
+    try:
+        return json.loads(json_text)
+    except json.JSONDecodeError:
+        pass
+
+    out = []
+    append = out.append
+    n = len(json_text)
+    i = 0
+    while i < n:
+        c = json_text[i]
+        if c == ',':
+            j = i + 1
+            while j < n and json_text[j] in ' \t\r\n':
+                j += 1
+            if j < n and json_text[j] in '}]':
+                i = j
+                continue
+        append(c)
+        i += 1
+    return json.loads(''.join(out))
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _decode_json_at(text, idx):
+    """Decode exactly one JSON value at idx (leading whitespace skipped).
+
+    Returns (value, end_index). Unlike a '(.*)' capture, raw_decode is a
+    single linear pass that stops precisely where the document ends, so
+    arguments containing commas or parens need no backtracking."""
+    n = len(text)
+    while idx < n and text[idx] in ' \t\r\n':
+        idx += 1
+    return _JSON_DECODER.raw_decode(text, idx)
+
+
+# Prefer the Cython-compiled hot paths when the extension has been built
+# (python setup.py build_ext --inplace). parse_single_condition returns
+# None for inputs outside its fast path, deferring to the Python logic.
+try:
+    from conversion_core import (
+        xml_to_json as _c_xml_to_json,
+        parse_single_condition as _c_parse_single_condition,
+    )
+except ImportError:
+    _c_xml_to_json = None
+    _c_parse_single_condition = None
+
+# Single-char substitution table; str.translate runs in C and beats
+# str.replace for the XPath -> dot-notation conversion
+_SLASH_TO_DOT = str.maketrans({'/': '.'})
+
+# Verbatim where-clause memo, cleared wholesale if it ever fills
+_WHERE_CACHE = {}
+
+
 class XQueryToMongoCRUDConverter:
+    __slots__ = ('var_mappings',)
+
     def __init__(self):
         self.var_mappings = {}
-        
+
     def parse_xquery(self, xquery_string):
         """Parse an XQuery CRUD statement and convert it to a MongoDB operation"""
-        
+
         # Clean and normalize the input
         xquery_string = xquery_string.strip()
-        
-        # Handle insert/create operations
-        if re.search(r'insert\s+node', xquery_string, re.IGNORECASE) or re.search(r'db\.collection\(["\'][^"\']+["\']\)\.insert', xquery_string, re.IGNORECASE):
-            return self._parse_insert(xquery_string)
-            
-        # Handle update operations
-        elif re.search(r'replace\s+node|update\s+value', xquery_string, re.IGNORECASE) or re.search(r'db\.collection\(["\'][^"\']+["\']\)\.update', xquery_string, re.IGNORECASE):
-            return self._parse_update(xquery_string)
-            
-        # Handle delete operations
-        elif re.search(r'delete\s+node', xquery_string, re.IGNORECASE) or re.search(r'db\.collection\(["\'][^"\']+["\']\)\.remove', xquery_string, re.IGNORECASE):
-            return self._parse_delete(xquery_string)
-        
-        # Handle read/query operations
-        elif re.search(r'for\s+\$\w+\s+in\s+collection|db\.collection\(["\'][^"\']+["\']\)\.find', xquery_string, re.IGNORECASE):
-            return self._parse_read(xquery_string)
-        
-        else:
+
+        # The CRUD markers are fixed literals: one casefold, then a C-level
+        # str.find per marker. The leftmost hit picks the handler, and a
+        # hit at offset 0 ends the scan early. The handlers still
+        # validate the full statement structure.
+        low = xquery_string.casefold()
+        find = low.find
+
+        handler = None
+        best = len(low) + 1
+        for marker, name in _DISPATCH_MARKERS:
+            pos = find(marker)
+            if 0 <= pos < best:
+                best = pos
+                handler = name
+                if pos == 0:
+                    break
+
+        if handler is None:
             raise ValueError(f"Unsupported XQuery CRUD syntax: {xquery_string}")
-    
+
+        return getattr(self, handler)(xquery_string)
+
     def _parse_insert(self, xquery_string):
         """Parse an XQuery insert statement"""
-        
+
+        # Fast path: db.collection("collectionName").insert({...}) with
+        # strictly valid JSON. raw_decode consumes exactly the document;
+        # anything it rejects falls through to the lenient regex branch.
+        head = _COLLECTION_HEAD_RE.search(xquery_string)
+        if head and xquery_string[head.end():head.end() + 8].lower() == '.insert(':
+            try:
+                doc, _ = _decode_json_at(xquery_string, head.end() + 8)
+            except json.JSONDecodeError:
+                pass
+            else:
+                return {
+                    "collection": head.group(1),
+                    "operation": "insertOne",
+                    "document": doc
+                }
+
         # MongoDB-like syntax: db.collection("collectionName").insert({...})
-        mongo_style_match = re.search(r'db\.collection\(["\']([^"\']+)["\']\)\.insert\((.*)\)', xquery_string, re.IGNORECASE | re.DOTALL)
+        mongo_style_match = _MONGO_INSERT_RE.search(xquery_string)
         if mongo_style_match:
             collection_name = mongo_style_match.group(1)
             doc_json = mongo_style_match.group(2).strip()
-            
+
             # Try to parse the JSON document
             try:
-                # Remove any trailing commas and clean up the JSON
-                doc_json = re.sub(r',\s*}', '}', doc_json)
-                doc_json = re.sub(r',\s*]', ']', doc_json)
-                
-                # Parse the document as JSON
-                doc = json.loads(doc_json)
-                
+                doc = _loads_lenient(doc_json)
+
                 return {
                     "collection": collection_name,
                     "operation": "insertOne",
@@ -58,13 +236,13 @@ class XQueryToMongoCRUDConverter:
                 }
             except json.JSONDecodeError as e:
                 raise ValueError(f"Could not parse insert document JSON: {e}")
-        
+
         # XQuery style: insert node <element>...</element> into collection("collectionName")
-        xquery_style_match = re.search(r'insert\s+node\s+(.*?)\s+into\s+collection\(["\']([^"\']+)["\']\)', xquery_string, re.IGNORECASE | re.DOTALL)
+        xquery_style_match = _INSERT_INTO_RE.search(xquery_string)
         if xquery_style_match:
             xml_content = xquery_style_match.group(1).strip()
             collection_name = xquery_style_match.group(2)
-            
+
             # Try to parse the XML and convert to JSON
             try:
                 # If it's a direct JSON object
@@ -75,16 +253,18 @@ class XQueryToMongoCRUDConverter:
                         raise ValueError("Could not parse insert JSON content")
                 # If it's XML
                 else:
-                    # Remove any XML declaration
-                    xml_content = re.sub(r'<\?xml[^>]+\?>', '', xml_content)
-                    
+                    # Remove any XML declaration; it can only sit at the
+                    # front, so two string ops beat a regex pass
+                    if xml_content.startswith('<?xml'):
+                        xml_content = xml_content[xml_content.find('?>') + 2:].lstrip()
+
                     # Parse XML to JSON
                     try:
                         xml_tree = etree.fromstring(xml_content)
                         doc = self._xml_to_json(xml_tree)
                     except Exception as e:
                         raise ValueError(f"Could not parse XML: {e}")
-                
+
                 return {
                     "collection": collection_name,
                     "operation": "insertOne",
@@ -92,64 +272,97 @@ class XQueryToMongoCRUDConverter:
                 }
             except Exception as e:
                 raise ValueError(f"Could not process insert operation: {e}")
-        
+
         raise ValueError(f"Unsupported insert syntax: {xquery_string}")
-    
+
     def _xml_to_json(self, element):
-        """Convert an XML element to a JSON object"""
-        result = {}
-        
-        # Handle attributes
-        for key, value in element.attrib.items():
-            result[f"@{key}"] = value
-        
-        # Handle child elements
-        for child in element:
-            child_dict = self._xml_to_json(child)
-            tag = child.tag
-            
-            if tag in result:
-                # If this tag already exists, convert to a list or append
-                if isinstance(result[tag], list):
-                    result[tag].append(child_dict)
-                else:
-                    result[tag] = [result[tag], child_dict]
+        """Convert an XML element to a JSON object.
+
+        Iterative traversal: lxml emits start/end events in C and we keep
+        an explicit stack of partial dicts, so there is no Python frame
+        per element and no recursion limit on deep documents.
+        """
+        if _c_xml_to_json is not None:
+            return _c_xml_to_json(element)
+
+        _isinstance, _list = isinstance, list
+        stack = [{}]
+        push, pop = stack.append, stack.pop
+
+        for event, elem in etree.iterwalk(element, events=('start', 'end')):
+            if event == 'start':
+                node = {}
+                if elem.attrib:
+                    node.update((f"@{key}", value) for key, value in elem.attrib.items())
+                push(node)
             else:
-                result[tag] = child_dict
-        
-        # Handle text content
-        if element.text and element.text.strip():
-            if result:  # Has attributes or children
-                result["#text"] = element.text.strip()
-            else:  # Just text
-                return element.text.strip()
-        
-        return result
-    
+                node = pop()
+
+                # Text content: plain string for leaf elements, "#text"
+                # key when attributes or children are present
+                text = elem.text
+                if text and text.strip():
+                    if node:
+                        node["#text"] = text.strip()
+                    else:
+                        node = text.strip()
+
+                # Merge into the parent, promoting to a list on tag collision
+                parent = stack[-1]
+                tag = elem.tag
+                existing = parent.setdefault(tag, node)
+                if existing is not node:
+                    if _isinstance(existing, _list):
+                        existing.append(node)
+                    else:
+                        parent[tag] = [existing, node]
+
+        return stack[0][element.tag]
+
     def _parse_update(self, xquery_string):
         """Parse an XQuery update statement"""
-        
+
+        # Fast path: db.collection("collectionName").update({query}, {update})
+        # -- two successive raw_decode calls walk the argument list once,
+        # so queries containing commas parse correctly instead of being
+        # split at the first ','. Failures fall through to the regex branch.
+        head = _COLLECTION_HEAD_RE.search(xquery_string)
+        if head and xquery_string[head.end():head.end() + 8].lower() == '.update(':
+            try:
+                query, end = _decode_json_at(xquery_string, head.end() + 8)
+                comma = xquery_string.index(',', end)
+                update, update_end = _decode_json_at(xquery_string, comma + 1)
+            except ValueError:  # JSONDecodeError or no comma found
+                pass
+            else:
+                update_text = xquery_string[comma + 1:update_end].strip()
+                if not (update_text.startswith('{') and any(op in update_text for op in ('"$set"', '"$inc"', '"$push"'))):
+                    # If no MongoDB operators specified, wrap in $set
+                    update = {"$set": update}
+                return {
+                    "collection": head.group(1),
+                    "operation": "updateMany",
+                    "filter": query,
+                    "update": update
+                }
+
         # MongoDB-like syntax: db.collection("collectionName").update({query}, {update})
-        mongo_style_match = re.search(r'db\.collection\(["\']([^"\']+)["\']\)\.update\((.*?),\s*(.*)\)', xquery_string, re.IGNORECASE | re.DOTALL)
+        mongo_style_match = _MONGO_UPDATE_RE.search(xquery_string)
         if mongo_style_match:
             collection_name = mongo_style_match.group(1)
             query_json = mongo_style_match.group(2).strip()
             update_json = mongo_style_match.group(3).strip()
-            
+
             try:
-                # Clean up and parse the JSON
-                query_json = re.sub(r',\s*}', '}', query_json)
-                update_json = re.sub(r',\s*}', '}', update_json)
-                
-                query = json.loads(query_json)
-                
+                query = _loads_lenient(query_json)
+
                 # Check if the update uses MongoDB operators
-                if update_json.strip().startswith('{') and re.search(r'"\$set"|"\$inc"|"\$push"', update_json):
-                    update = json.loads(update_json)
+                if update_json.strip().startswith('{') and any(op in update_json for op in ('"$set"', '"$inc"', '"$push"')):
+                    update = _loads_lenient(update_json)
                 else:
                     # If no MongoDB operators specified, wrap in $set
-                    update = {"$set": json.loads(update_json)}
-                
+                    update = {"$set": _loads_lenient(update_json)}
+
                 return {
                     "collection": collection_name,
                     "operation": "updateMany",
@@ -158,37 +371,34 @@ class XQueryToMongoCRUDConverter:
                 }
             except json.JSONDecodeError as e:
                 raise ValueError(f"Could not parse update JSON: {e}")
-        
+
         # XQuery style: replace/update statements
-        replace_node_match = re.search(r'replace\s+node\s+(.*?)\s+with\s+(.*?)(?:where|in\s+collection)', xquery_string, re.IGNORECASE | re.DOTALL)
+        replace_node_match = _REPLACE_NODE_RE.search(xquery_string)
         if replace_node_match:
             target_path = replace_node_match.group(1).strip()
             replacement = replace_node_match.group(2).strip()
-            
+
             # Extract collection name
-            collection_match = re.search(r'in\s+collection\(["\']([^"\']+)["\']\)', xquery_string)
-            if not collection_match:
+            collection_name = self._extract_collection(xquery_string)
+            if collection_name is None:
                 raise ValueError("Collection name not found in replace statement")
-            
-            collection_name = collection_match.group(1)
-            
+
             # Extract where condition if present
-            where_match = re.search(r'where\s+(.*?)(?:in\s+collection|\Z)', xquery_string, re.IGNORECASE | re.DOTALL)
-            where_clause = where_match.group(1).strip() if where_match else None
-            
+            where_clause = self._extract_where(xquery_string)
+
             # Parse the target path and build query
-            path_parts = re.search(r'\$(\w+)(?:/([^/]+))?', target_path)
+            path_parts = _PATH_PARTS_RE.search(target_path)
             if not path_parts:
                 raise ValueError(f"Could not parse target path: {target_path}")
-            
+
             var_name = path_parts.group(1)
             field_path = path_parts.group(2).replace('/', '.') if path_parts.group(2) else None
-            
+
             # Build query from where clause
             query = {}
             if where_clause:
                 query = self._parse_where_clause(where_clause, var_name)
-            
+
             # Parse the replacement value
             update_value = None
             if replacement.startswith('{') and replacement.endswith('}'):
@@ -198,85 +408,80 @@ class XQueryToMongoCRUDConverter:
                     update_value = replacement
             else:
                 update_value = replacement
-            
+
             # Build the update operation
             update = {}
             if field_path:
                 update = {"$set": {field_path: update_value}}
             else:
                 update = {"$set": update_value}
-            
+
             return {
                 "collection": collection_name,
                 "operation": "updateMany",
                 "filter": query,
                 "update": update
             }
-        
+
         # XQuery update value syntax
-        update_value_match = re.search(r'update\s+value\s+(.*?)\s+with\s+(.*?)(?:where|in\s+collection)', xquery_string, re.IGNORECASE | re.DOTALL)
+        update_value_match = _UPDATE_VALUE_RE.search(xquery_string)
         if update_value_match:
             target_path = update_value_match.group(1).strip()
             new_value = update_value_match.group(2).strip()
-            
+
             # Extract collection name
-            collection_match = re.search(r'in\s+collection\(["\']([^"\']+)["\']\)', xquery_string)
-            if not collection_match:
+            collection_name = self._extract_collection(xquery_string)
+            if collection_name is None:
                 raise ValueError("Collection name not found in update statement")
-            
-            collection_name = collection_match.group(1)
-            
+
             # Extract where condition if present
-            where_match = re.search(r'where\s+(.*?)(?:in\s+collection|\Z)', xquery_string, re.IGNORECASE | re.DOTALL)
-            where_clause = where_match.group(1).strip() if where_match else None
-            
+            where_clause = self._extract_where(xquery_string)
+
             # Parse the target path and build query
-            path_parts = re.search(r'\$(\w+)(?:/([^/]+))?', target_path)
+            path_parts = _PATH_PARTS_RE.search(target_path)
             if not path_parts:
                 raise ValueError(f"Could not parse target path: {target_path}")
-            
+
             var_name = path_parts.group(1)
             field_path = path_parts.group(2).replace('/', '.') if path_parts.group(2) else None
-            
+
             # Build query from where clause
             query = {}
             if where_clause:
                 query = self._parse_where_clause(where_clause, var_name)
-            
+
             # Parse the new value
             if new_value.startswith('"') and new_value.endswith('"'):
                 new_value = new_value[1:-1]  # Remove quotes
             elif new_value.isdigit():
                 new_value = int(new_value)
-            elif re.match(r'^[0-9]+\.[0-9]+$', new_value):
+            elif _FLOAT_RE.match(new_value):
                 new_value = float(new_value)
-            
+
             # Build the update operation
             update = {"$set": {field_path: new_value}} if field_path else {"$set": new_value}
-            
+
             return {
                 "collection": collection_name,
                 "operation": "updateMany",
                 "filter": query,
                 "update": update
             }
-        
+
         raise ValueError(f"Unsupported update syntax: {xquery_string}")
-    
+
     def _parse_delete(self, xquery_string):
         """Parse an XQuery delete statement"""
-        
+
         # MongoDB-like syntax: db.collection("collectionName").remove({query})
-        mongo_style_match = re.search(r'db\.collection\(["\']([^"\']+)["\']\)\.remove\((.*)\)', xquery_string, re.IGNORECASE | re.DOTALL)
+        mongo_style_match = _MONGO_REMOVE_RE.search(xquery_string)
         if mongo_style_match:
             collection_name = mongo_style_match.group(1)
             query_json = mongo_style_match.group(2).strip()
-            
+
             try:
-                # Clean up and parse the JSON
-                query_json = re.sub(r',\s*}', '}', query_json)
-                query = json.loads(query_json)
-                
+                query = _loads_lenient(query_json)
+
                 return {
                     "collection": collection_name,
                     "operation": "deleteMany",
@@ -284,67 +489,52 @@ class XQueryToMongoCRUDConverter:
                 }
             except json.JSONDecodeError as e:
                 raise ValueError(f"Could not parse delete query JSON: {e}")
-        
+
         # XQuery style: delete node statements
-        delete_node_match = re.search(r'delete\s+node\s+(.*?)(?:where|in\s+collection)', xquery_string, re.IGNORECASE | re.DOTALL)
+        delete_node_match = _DELETE_NODE_TARGET_RE.search(xquery_string)
         if delete_node_match:
             target_path = delete_node_match.group(1).strip()
-            
+
             # Extract collection name
-            collection_match = re.search(r'in\s+collection\(["\']([^"\']+)["\']\)', xquery_string)
-            if not collection_match:
+            collection_name = self._extract_collection(xquery_string)
+            if collection_name is None:
                 raise ValueError("Collection name not found in delete statement")
-            
-            collection_name = collection_match.group(1)
-            
+
             # Extract where condition if present
-            where_match = re.search(r'where\s+(.*?)(?:in\s+collection|\Z)', xquery_string, re.IGNORECASE | re.DOTALL)
-            where_clause = where_match.group(1).strip() if where_match else None
-            
+            where_clause = self._extract_where(xquery_string)
+
             # Parse the target path and build query
-            path_parts = re.search(r'\$(\w+)(?:/([^/]+))?', target_path)
+            path_parts = _PATH_PARTS_RE.search(target_path)
             if not path_parts:
                 raise ValueError(f"Could not parse target path: {target_path}")
-            
+
             var_name = path_parts.group(1)
-            
+
             # Build query from where clause
             query = {}
             if where_clause:
                 query = self._parse_where_clause(where_clause, var_name)
-            
+
             return {
                 "collection": collection_name,
                 "operation": "deleteMany",
                 "filter": query
             }
-        
+
         raise ValueError(f"Unsupported delete syntax: {xquery_string}")
-    
+
     def _parse_read(self, xquery_string):
         """Parse an XQuery read/query statement"""
-        
+
         # MongoDB-like syntax: db.collection("collectionName").find({query})
-        mongo_style_match = re.search(r'db\.collection\(["\']([^"\']+)["\']\)\.find\((.*?)\)', xquery_string, re.IGNORECASE | re.DOTALL)
+        mongo_style_match = _MONGO_FIND_RE.search(xquery_string)
         if mongo_style_match:
             collection_name = mongo_style_match.group(1)
             query_json = mongo_style_match.group(2).strip()
-            
-            try:
-                # Clean up and parse the JSON
-                query_json =
-
-
-
-
 
+            try:
+                query = _loads_lenient(query_json) if query_json else {}
 
-query_json = re.sub(r',\s*}', '}', query_json)
-                if not query_json:
-                    query = {}
-                else:
-                    query = json.loads(query_json)
-                
                 return {
                     "collection": collection_name,
                     "operation": "find",
@@ -352,301 +542,314 @@ query_json = re.sub(r',\s*}', '}', query_json)
                 }
             except json.JSONDecodeError as e:
                 raise ValueError(f"Could not parse query JSON: {e}")
-        
+
         # XQuery style: for $var in collection("collectionName") where ...
-        xquery_style_match = re.search(r'for\s+\$(\w+)\s+in\s+collection\(["\']([^"\']+)["\']\)(.*)', xquery_string, re.IGNORECASE | re.DOTALL)
+        xquery_style_match = _FOR_IN_COLLECTION_RE.search(xquery_string)
         if xquery_style_match:
             var_name = xquery_style_match.group(1)
             collection_name = xquery_style_match.group(2)
             rest_of_query = xquery_style_match.group(3).strip()
-            
+
             # Save variable mapping
             self.var_mappings[var_name] = collection_name
-            
+
             # Extract where condition if present
-            where_match = re.search(r'where\s+(.*?)(?:order\s+by|\Z)', rest_of_query, re.IGNORECASE | re.DOTALL)
+            where_match = _WHERE_BEFORE_ORDER_RE.search(rest_of_query)
             where_clause = where_match.group(1).strip() if where_match else None
-            
+
             # Build query from where clause
             query = {}
             if where_clause:
                 query = self._parse_where_clause(where_clause, var_name)
-            
+
             # Check for order by clause
-            order_by_match = re.search(r'order\s+by\s+(.*?)(?:return|\Z)', rest_of_query, re.IGNORECASE | re.DOTALL)
+            order_by_match = _ORDER_BY_RE.search(rest_of_query)
             sort = None
             if order_by_match:
                 sort_clause = order_by_match.group(1).strip()
                 sort = self._parse_order_by(sort_clause, var_name)
-            
+
             # Check for projection in return clause
             projection = None
-            return_match = re.search(r'return\s+(.*)', rest_of_query, re.IGNORECASE | re.DOTALL)
+            return_match = _RETURN_RE.search(rest_of_query)
             if return_match:
                 return_clause = return_match.group(1).strip()
                 projection = self._parse_return_clause(return_clause, var_name)
-            
+
             result = {
                 "collection": collection_name,
                 "operation": "find",
                 "filter": query
             }
-            
+
             if sort:
                 result["sort"] = sort
-            
+
             if projection:
                 result["projection"] = projection
-            
+
             return result
-        
+
         raise ValueError(f"Unsupported read syntax: {xquery_string}")
-    
+
+    @staticmethod
+    def _extract_collection(xquery_string):
+        """Extract the collection name from an 'in collection(...)' clause, or None"""
+        match = _COLLECTION_IN_RE.search(xquery_string)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _extract_where(xquery_string):
+        """Extract the where-clause text, or None when absent"""
+        match = _WHERE_RE.search(xquery_string)
+        return match.group(1).strip() if match else None
+
+    def _parse_where_clause(self, where_clause, context_var):
+        """Parse a where clause into a MongoDB query document.
+
+        Clauses seen verbatim before are served from a cache; callers get
+        a shallow copy so the cached document cannot be mutated downstream.
+        """
+        key = (where_clause, context_var)
+        query = _WHERE_CACHE.get(key)
+        if query is None:
+            query = {}
+            for condition in _AND_SPLIT_RE.split(where_clause):
+                query.update(self._parse_single_condition(condition.strip(), context_var))
+            if len(_WHERE_CACHE) >= 4096:
+                _WHERE_CACHE.clear()
+            _WHERE_CACHE[key] = query
+
+        return copy.copy(query)
+
     def _parse_single_condition(self, condition, context_var):
         """Parse a single condition in a where clause into a MongoDB query operator"""
-        
+
         # Strip any parentheses
         condition = condition.strip('()')
-        
-        # Check for equality condition: $item/field = "value" or $item/field eq "value"
-        eq_match = re.search(r'(\$\w+(?:/[^/\s]+)*)\s*=\s*(.+)', condition) or re.search(r'(\$\w+(?:/[^/\s]+)*)\s+eq\s+(.+)', condition)
-        if eq_match:
-            path = eq_match.group(1).strip()
-            value = eq_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_value = self._parse_value(value)
-            
-            return {field: parsed_value}
-        
-        # Check for inequality condition: $item/field != "value" or $item/field ne "value"
-        ne_match = re.search(r'(\$\w+(?:/[^/\s]+)*)\s*!=\s*(.+)', condition) or re.search(r'(\$\w+(?:/[^/\s]+)*)\s+ne\s+(.+)', condition)
-        if ne_match:
-            path = ne_match.group(1).strip()
-            value = ne_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_value = self._parse_value(value)
-            
-            return {field: {"$ne": parsed_value}}
-        
-        # Check for greater than condition: $item/field > value or $item/field gt value
-        gt_match = re.search(r'(\$\w+(?:/[^/\s]+)*)\s*>\s*(.+)', condition) or re.search(r'(\$\w+(?:/[^/\s]+)*)\s+gt\s+(.+)', condition)
-        if gt_match:
-            path = gt_match.group(1).strip()
-            value = gt_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_value = self._parse_value(value)
-            
-            return {field: {"$gt": parsed_value}}
-        
-        # Check for greater than or equal condition: $item/field >= value or $item/field ge value
-        gte_match = re.search(r'(\$\w+(?:/[^/\s]+)*)\s*>=\s*(.+)', condition) or re.search(r'(\$\w+(?:/[^/\s]+)*)\s+ge\s+(.+)', condition)
-        if gte_match:
-            path = gte_match.group(1).strip()
-            value = gte_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_value = self._parse_value(value)
-            
-            return {field: {"$gte": parsed_value}}
-        
-        # Check for less than condition: $item/field < value or $item/field lt value
-        lt_match = re.search(r'(\$\w+(?:/[^/\s]+)*)\s*<\s*(.+)', condition) or re.search(r'(\$\w+(?:/[^/\s]+)*)\s+lt\s+(.+)', condition)
-        if lt_match:
-            path = lt_match.group(1).strip()
-            value = lt_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_value = self._parse_value(value)
-            
-            return {field: {"$lt": parsed_value}}
-        
-        # Check for less than or equal condition: $item/field <= value or $item/field le value
-        lte_match = re.search(r'(\$\w+(?:/[^/\s]+)*)\s*<=\s*(.+)', condition) or re.search(r'(\$\w+(?:/[^/\s]+)*)\s+le\s+(.+)', condition)
-        if lte_match:
-            path = lte_match.group(1).strip()
-            value = lte_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_value = self._parse_value(value)
-            
-            return {field: {"$lte": parsed_value}}
-        
-        # Check for contains condition: contains($item/field, "substring")
-        contains_match = re.search(r'contains\s*\(\s*(\$\w+(?:/[^/\s,]+)*)\s*,\s*(.+?)\s*\)', condition)
-        if contains_match:
-            path = contains_match.group(1).strip()
-            substring = contains_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_substring = self._parse_value(substring)
-            
-            if isinstance(parsed_substring, str):
-                # Use regex for string contains
-                return {field: {"$regex": parsed_substring, "$options": "i"}}
-            else:
-                raise ValueError(f"contains() operator can only be used with strings, got: {substring}")
-        
-        # Check for starts-with condition: starts-with($item/field, "prefix")
-        starts_with_match = re.search(r'starts\-with\s*\(\s*(\$\w+(?:/[^/\s,]+)*)\s*,\s*(.+?)\s*\)', condition)
-        if starts_with_match:
-            path = starts_with_match.group(1).strip()
-            prefix = starts_with_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_prefix = self._parse_value(prefix)
-            
-            if isinstance(parsed_prefix, str):
-                # Use regex for starts-with
-                return {field: {"$regex": f"^{re.escape(parsed_prefix)}", "$options": "i"}}
-            else:
-                raise ValueError(f"starts-with() operator can only be used with strings, got: {prefix}")
-        
-        # Check for ends-with condition: ends-with($item/field, "suffix")
-        ends_with_match = re.search(r'ends\-with\s*\(\s*(\$\w+(?:/[^/\s,]+)*)\s*,\s*(.+?)\s*\)', condition)
-        if ends_with_match:
-            path = ends_with_match.group(1).strip()
-            suffix = ends_with_match.group(2).strip()
-            field = self._parse_path(path, context_var)
-            parsed_suffix = self._parse_value(suffix)
-            
-            if isinstance(parsed_suffix, str):
-                # Use regex for ends-with
-                return {field: {"$regex": f"{re.escape(parsed_suffix)}$", "$options": "i"}}
+
+        # Compiled fast path for the common '$path OP value' shape
+        if _c_parse_single_condition is not None:
+            compiled = _c_parse_single_condition(condition, context_var)
+            if compiled is not None:
+                return compiled
+
+        # Bind the memoized helpers once; they are called from every branch
+        parse_path = self._parse_path
+        parse_value = self._parse_value
+
+        # Comparators: one scan classifies the operator, the table maps it
+        cond_match = _COND_RE.search(condition)
+        if cond_match:
+            field = parse_path(cond_match.group('path').strip(), context_var)
+            parsed_value = parse_value(cond_match.group('val').strip())
+            mongo_op = next(_COND_OPS[name] for name in _COND_OPS if cond_match.group(name))
+
+            if mongo_op is None:
+                return {field: parsed_value}
+            return {field: {mongo_op: parsed_value}}
+
+        # String predicates: contains / starts-with / ends-with
+        fn_match = _FN_RE.search(condition)
+        if fn_match:
+            fn = fn_match.group('fn')
+            field = parse_path(fn_match.group('fpath').strip(), context_var)
+            parsed_arg = parse_value(fn_match.group('farg').strip())
+
+            if isinstance(parsed_arg, str):
+                return {field: _FN_BUILDERS[fn](parsed_arg)}
             else:
-                raise ValueError(f"ends-with() operator can only be used with strings, got: {suffix}")
-        
+                raise ValueError(f"{fn}() operator can only be used with strings, got: {fn_match.group('farg').strip()}")
+
         # Check for exists condition: exists($item/field)
-        exists_match = re.search(r'exists\s*\(\s*(\$\w+(?:/[^/\s]+)*)\s*\)', condition)
+        exists_match = _EXISTS_RE.search(condition)
         if exists_match:
             path = exists_match.group(1).strip()
-            field = self._parse_path(path, context_var)
-            
+            field = parse_path(path, context_var)
+
             return {field: {"$exists": True}}
-        
+
         # Check for not exists condition: not(exists($item/field))
-        not_exists_match = re.search(r'not\s*\(\s*exists\s*\(\s*(\$\w+(?:/[^/\s]+)*)\s*\)\s*\)', condition)
+        not_exists_match = _NOT_EXISTS_RE.search(condition)
         if not_exists_match:
             path = not_exists_match.group(1).strip()
-            field = self._parse_path(path, context_var)
-            
+            field = parse_path(path, context_var)
+
             return {field: {"$exists": False}}
-        
+
         raise ValueError(f"Unsupported condition: {condition}")
-    
-    def _parse_path(self, path, context_var):
-        """Parse an XPath-like path into a MongoDB field path"""
-        
-        # Replace variable with empty prefix
-        if path.startswith(f"${context_var}/"):
-            path = path[len(f"${context_var}/"):]
-        elif path == f"${context_var}":
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_path(path, context_var):
+        """Parse an XPath-like path into a MongoDB field path.
+
+        Pure in (path, context_var), so results are memoized: real
+        workloads repeat the same path expressions across statements.
+        """
+
+        # Replace variable with empty prefix; build the "$var/" prefix
+        # once instead of formatting it per comparison
+        prefix = '$' + context_var + '/'
+        if path.startswith(prefix):
+            path = path[len(prefix):]
+        elif path == prefix[:-1]:
             return "_id"  # Default to _id for the document itself
-        
+
         # Convert XPath notation to dot notation
-        return path.replace('/', '.')
-    
-    def _parse_value(self, value_str):
-        """Parse a value string into the appropriate type"""
-        
+        return path.translate(_SLASH_TO_DOT)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_value(value_str):
+        """Parse a value string into the appropriate type.
+
+        This is a type dispatch, not a pattern match, so it runs on pure
+        string operations -- no regex engine entry per literal.
+        """
+
         value_str = value_str.strip()
-        
+
         # String literal
-        if (value_str.startswith('"') and value_str.endswith('"')) or (value_str.startswith("'") and value_str.endswith("'")):
+        quote = value_str[:1]
+        if quote in ('"', "'") and value_str.endswith(quote):
             return value_str[1:-1]
-        
+
         # Number
         if value_str.isdigit():
             return int(value_str)
-        
+
         # Float
         try:
-            if re.match(r'^[0-9]+\.[0-9]+$', value_str):
-                return float(value_str)
+            return float(value_str)
         except ValueError:
             pass
-        
-        # Boolean
-        if value_str.lower() == 'true':
+
+        # Boolean / null, with the case fold done once
+        low = value_str.lower()
+        if low == 'true':
             return True
-        if value_str.lower() == 'false':
+        if low == 'false':
             return False
-        
-        # Null/None
-        if value_str.lower() in ('null', 'none'):
+        if low in ('null', 'none'):
             return None
-        
-        # Function call or complex expression
-        if '(' in value_str:
-            # This is a simplified handling - for complex expressions,
-            # you might need more sophisticated parsing
-            return value_str
-        
+
+        # Function call or other complex expression stays as-is
         return value_str
-    
+
     def _parse_order_by(self, order_by_clause, context_var):
         """Parse an order by clause into a MongoDB sort specification"""
-        
+
         sort_spec = {}
-        parts = re.split(r',\s*', order_by_clause)
-        
-        for part in parts:
-            # Check for descending order
-            if re.search(r'descending$', part, re.IGNORECASE):
+        parse_path = self._parse_path
+
+        for part in order_by_clause.split(','):
+            part = part.strip()
+            low = part.lower()
+
+            # Direction keywords are plain ASCII suffixes; no regex needed
+            if low.endswith(' descending'):
                 direction = -1
-                part = re.sub(r'\s+descending$', '', part, flags=re.IGNORECASE)
+                part = part[:-len(' descending')].rstrip()
             else:
                 direction = 1
                 # Remove potential "ascending" keyword
-                part = re.sub(r'\s+ascending$', '', part, flags=re.IGNORECASE)
-            
+                if low.endswith(' ascending'):
+                    part = part[:-len(' ascending')].rstrip()
+
             # Parse the field path
-            field = self._parse_path(part.strip(), context_var)
+            field = parse_path(part, context_var)
             sort_spec[field] = direction
-        
+
         return sort_spec
-    
+
     def _parse_return_clause(self, return_clause, context_var):
         """Parse a return clause into a MongoDB projection"""
-        
-        # Simple projection based on direct field references
-        projection = {}
-        
-        # Look for explicitly mentioned fields
-        field_pattern = r'\$' + context_var + r'/([^/\s,]+)'
-        fields = re.findall(field_pattern, return_clause)
-        
-        for field in fields:
-            projection[field] = 1
-        
+
+        # One shared pattern captures any variable reference; the filter on
+        # the variable name replaces interpolating context_var into the
+        # pattern, and finditer streams matches instead of building a list
+        projection = {
+            match.group(2): 1
+            for match in _RETURN_FIELD_RE.finditer(return_clause)
+            if match.group(1) == context_var
+        }
+
         # If specific fields are listed, exclude _id unless explicitly included
-        if fields and '_id' not in projection:
+        if projection and '_id' not in projection:
             projection['_id'] = 0
-        
+
         return projection
 
 
+# Shared by the serial path and by forked pool workers; fork-COW means
+# every worker reuses this instance and the compiled module patterns.
+_CONVERTER = XQueryToMongoCRUDConverter()
+
+if orjson is None:
+    _dumps = json.dumps
+else:
+    def _dumps(obj):
+        # orjson emits bytes with no separator padding; decode for the
+        # text output stream
+        return orjson.dumps(obj).decode()
+
+def _parse_line(line):
+    """Parse one statement; returns (serialized, None) or (None, error)."""
+    try:
+        return _dumps(_CONVERTER.parse_xquery(line)), None
+    except Exception as e:
+        return None, e
+
+
 def main():
     parser = argparse.ArgumentParser(description='Convert XQuery CRUD statements to MongoDB operations')
     parser.add_argument('file', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
                         help='Input file with XQuery statements (default: stdin)')
     parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
                         help='Output file for MongoDB operations (default: stdout)')
-    
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for parsing (0 = one per core; default: serial)')
+
     args = parser.parse_args()
-    
-    converter = XQueryToMongoCRUDConverter()
-    
-    for line in args.file:
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        
-        try:
-            result = converter.parse_xquery(line)
-            args.output.write(json.dumps(result, indent=2) + '\n')
-        except Exception as e:
-            print(f"Error processing line: {line}", file=sys.stderr)
-            print(f"Error: {e}", file=sys.stderr)
 
+    # One bulk read, then drop blanks and comments up front so the work
+    # items are exactly the statements to parse
+    lines = [line.strip() for line in args.file.read().splitlines()]
+    lines = [line for line in lines if line and not line.startswith('#')]
 
-if __name__ == "__main__":
-    main()
+    pool = None
+    if args.jobs == 1:
+        results = map(_parse_line, lines)
+    else:
+        # Each statement parses independently, and forked workers inherit
+        # the compiled patterns and the module-level converter for free
+        pool = multiprocessing.Pool(args.jobs if args.jobs > 0 else None)
+        results = pool.imap(_parse_line, lines, chunksize=256)
 
+    # Buffer serialized records and write them in batches instead of a
+    # syscall per line
+    write = args.output.write
+    parts = []
 
+    for line, (serialized, error) in zip(lines, results):
+        if error is not None:
+            print(f"Error processing line: {line}", file=sys.stderr)
+            print(f"Error: {error}", file=sys.stderr)
+            continue
 
+        parts.append(serialized)
+        if len(parts) >= 1024:
+            write('\n'.join(parts) + '\n')
+            del parts[:]
 
+    if parts:
+        write('\n'.join(parts) + '\n')
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+
+if __name__ == "__main__":
+    main()
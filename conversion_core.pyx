@@ -0,0 +1,158 @@
+# cython: language_level=3
+# Optional C-compiled hot paths for conversion.py. Build in place with:
+#   python setup.py build_ext --inplace
+# Both entry points mirror their pure-Python counterparts.
+# parse_single_condition covers only the comparator fast path and
+# returns None for anything else (string predicates, exists, inputs that
+# would need regex backtracking), so the Python implementation can take
+# over and behavior stays identical either way.
+
+cdef dict _OP_TABLE = {
+    'eq': None,
+    'ne': '$ne',
+    'gt': '$gt',
+    'ge': '$gte',
+    'lt': '$lt',
+    'le': '$lte',
+}
+
+
+cpdef object xml_to_json(object element):
+    """Typed port of XQueryToMongoCRUDConverter._xml_to_json."""
+    cdef dict result = {}
+    cdef str key, tag
+    cdef object child, child_value, existing, text
+
+    for key, value in element.attrib.items():
+        result['@' + key] = value
+
+    for child in element:
+        child_value = xml_to_json(child)
+        tag = child.tag
+        existing = result.setdefault(tag, child_value)
+        if existing is not child_value:
+            if type(existing) is list:
+                (<list>existing).append(child_value)
+            else:
+                result[tag] = [existing, child_value]
+
+    text = element.text
+    if text is not None and (<str>text).strip():
+        if result:
+            result['#text'] = (<str>text).strip()
+        else:
+            return (<str>text).strip()
+
+    return result
+
+
+cdef object _parse_value(str value_str):
+    cdef str low, quote
+    value_str = value_str.strip()
+
+    quote = value_str[:1]
+    if (quote == '"' or quote == "'") and value_str.endswith(quote):
+        return value_str[1:-1]
+
+    if value_str.isdigit():
+        return int(value_str)
+
+    try:
+        return float(value_str)
+    except ValueError:
+        pass
+
+    low = value_str.lower()
+    if low == 'true':
+        return True
+    if low == 'false':
+        return False
+    if low == 'null' or low == 'none':
+        return None
+
+    return value_str
+
+
+cdef str _parse_path(str path, str context_var):
+    cdef str prefix = '$' + context_var + '/'
+    if path.startswith(prefix):
+        path = path[len(prefix):]
+    elif path == prefix[:-1]:
+        return '_id'
+    return path.replace('/', '.')
+
+
+cpdef object parse_single_condition(str condition, str context_var):
+    """Classify '$path OP value' with typed scanning; None if unsure.
+
+    Only answers when the first variable reference is directly followed
+    by a comparator, which is the overwhelmingly common shape; every
+    other input defers to the pure-Python classifier.
+    """
+    cdef Py_ssize_t n = len(condition)
+    cdef Py_ssize_t start, j, k, p, op_end
+    cdef bint had_ws
+    cdef str path, op, val, c
+    cdef object mongo_op, parsed
+
+    start = condition.find('$')
+    if start == -1 or start + 1 >= n:
+        return None
+
+    # Path: $\w+(/[^/\s]+)* with greedy segments; anything that would
+    # need backtracking to match is left to the regex fallback
+    j = start + 1
+    while j < n and (condition[j].isalnum() or condition[j] == '_'):
+        j += 1
+    if j == start + 1:
+        return None
+    while j < n and condition[j] == '/':
+        k = j + 1
+        while k < n and condition[k] != '/' and not condition[k].isspace():
+            k += 1
+        if k == j + 1:
+            break
+        j = k
+    path = condition[start:j]
+
+    # Operator, with the same priority as the fused pattern: symbolic
+    # single-char forms first ('>' before '>='), keywords only after
+    # at least one space
+    p = j
+    while p < n and condition[p].isspace():
+        p += 1
+    had_ws = p > j
+    if p >= n:
+        return None
+
+    c = condition[p]
+    if c == '=':
+        op = 'eq'
+        op_end = p + 1
+    elif c == '!' and p + 1 < n and condition[p + 1] == '=':
+        op = 'ne'
+        op_end = p + 2
+    elif c == '>':
+        op = 'gt'
+        op_end = p + 1
+    elif c == '<':
+        op = 'lt'
+        op_end = p + 1
+    elif had_ws and p + 2 < n and condition[p:p + 2] in _OP_TABLE and condition[p + 2].isspace():
+        op = condition[p:p + 2]
+        op_end = p + 3
+    else:
+        return None
+
+    val = condition[op_end:]
+    if '\n' in val:  # the fallback pattern stops values at newlines
+        return None
+    val = val.strip()
+    if not val:
+        return None
+
+    mongo_op = _OP_TABLE[op]
+    parsed = _parse_value(val)
+    if mongo_op is None:
+        return {_parse_path(path, context_var): parsed}
+    return {_parse_path(path, context_var): {mongo_op: parsed}}
@@ -1,117 +1,451 @@
-import re
-
-def convert_sql_to_mongo(sql):
-    # Convert SELECT statements with COUNT and JOIN
-    sql = re.sub(
-        r'SELECT COUNT{{{{\((.+?)\)}}}}, (.+?) FROM (\w+) INNER JOIN (\w+) ON (.+?) = (.+?) GROUP BY (.+?) ORDER BY COUNT{{{{\((.+?)\)}}}};',
-        lambda match: f'db.{match.group(3)}.aggregate([{{ $lookup: {{ from: "{match.group(4)}", localField: "{match.group(5).split(".")[1]}", foreignField: "{match.group(6).split(".")[1]}", as: "joined_docs" }} }}, {{ $unwind: "$joined_docs" }}, {{ $group: {{ _id: "${match.group(7)}", count: {{ $sum: 1 }} }} }}, {{ $sort: {{ count: -1 }} }}])',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert other SELECT statements
-    sql = re.sub(
-        r'SELECT (.+?) FROM (\w+)( WHERE (.+?))?( ORDER BY (.+?))?( LIMIT (\d+))?;',
-        lambda match: f'db.{match.group(2)}.find({{ {convert_where_clause(match.group(4))} }}, {{ {convert_select_fields(match.group(1))} }}){convert_order_by(match.group(6))}{convert_limit(match.group(8))}',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert INSERT statements
-    sql = re.sub(
-        r'INSERT INTO (\w+) {{{{\((.+?)\)}}}} VALUES {{{{\((.+?)\)}}}};',
-        lambda match: f'db.{match.group(1)}.insertOne({{ {convert_insert_fields(match.group(2), match.group(3))} }})',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert UPDATE statements
-    sql = re.sub(
-        r'UPDATE (\w+) SET (.+?) WHERE (.+?);',
-        lambda match: f'db.{match.group(1)}.updateOne({{ {convert_where_clause(match.group(3))} }}, {{ $set: {{ {convert_update_fields(match.group(2))} }} }})',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert DELETE statements
-    sql = re.sub(
-        r'DELETE FROM (\w+) WHERE (.+?);',
-        lambda match: f'db.{match.group(1)}.deleteOne({{ {convert_where_clause(match.group(2))} }})',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert COUNT statements
-    sql = re.sub(
-        r'SELECT COUNT{{{{\(\*\)}}}} FROM (\w+)( WHERE (.+?))?;',
-        lambda match: f'db.{match.group(1)}.countDocuments({{ {convert_where_clause(match.group(3))} }})',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert SUM statements
-    sql = re.sub(
-        r'SELECT SUM{{{{\((.+?)\)}}}} FROM (\w+)( WHERE (.+?))?;',
-        lambda match: f'db.{match.group(2)}.aggregate([{{ $match: {{ {convert_where_clause(match.group(4))} }} }}, {{ $group: {{ _id: null, total: {{ $sum: "${match.group(1)}" }} }} }}])',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert AVG statements
-    sql = re.sub(
-        r'SELECT AVG{{{{\((.+?)\)}}}} FROM (\w+)( WHERE (.+?))?;',
-        lambda match: f'db.{match.group(2)}.aggregate([{{ $match: {{ {convert_where_clause(match.group(4))} }} }}, {{ $group: {{ _id: null, average: {{ $avg: "${match.group(1)}" }} }} }}])',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    # Convert JOIN statements
-    sql = re.sub(
-        r'SELECT (.+?) FROM (\w+) a JOIN (\w+) b ON a\.(\w+) = b\.(\w+)( WHERE (.+?))?;',
-        lambda match: f'db.{match.group(2)}.aggregate([{{ $match: {{ {convert_where_clause(match.group(7))} }} }}, {{ $lookup: {{ from: "{match.group(3)}", localField: "{match.group(4)}", foreignField: "{match.group(5)}", as: "joined_docs" }} }}, {{ $unwind: "$joined_docs" }}, {{ $project: {{ {convert_select_fields(match.group(1))} }} }}])',
-        sql,
-        flags=re.IGNORECASE
-    )
-
-    return sql
-
-def convert_where_clause(where_clause):
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _maybe_jit(func):
+    """Compile a helper with Numba's nopython mode when it is installed.
+
+    The decorated scanners stick to str find/slice/strip/concat and
+    list-of-str appends, all of which nopython mode supports; without
+    Numba they run unchanged as plain Python."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+def _word(stmt, i):
+    """Scan a \\w+ run starting at i; returns (word, end_index)."""
+    j = i
+    n = len(stmt)
+    while j < n and (stmt[j].isalnum() or stmt[j] == '_'):
+        j += 1
+    return stmt[i:j], j
+
+
+def _valid_limit_at(rest, urest, start):
+    """Index of a ' LIMIT ' whose tail is all digits, or -1."""
+    k = urest.find(' LIMIT ', start)
+    while k != -1 and not rest[k + 7:].isdigit():
+        k = urest.find(' LIMIT ', k + 1)
+    return k
+
+
+def _split_clauses(rest, urest):
+    """Split the optional WHERE / ORDER BY / LIMIT tail of a SELECT.
+
+    Returns (where, order, limit) with None for absent clauses, or None
+    when the tail does not decompose into those clauses in that order."""
+    where = order = limit = None
+    n = len(rest)
+    i = 0
+
+    if urest.startswith(' WHERE '):
+        j = urest.find(' ORDER BY ', 7)
+        if j == -1:
+            j = _valid_limit_at(rest, urest, 7)
+        if j == -1:
+            j = n
+        if j == 7:
+            return None
+        where = rest[7:j]
+        i = j
+
+    if urest.startswith(' ORDER BY ', i):
+        j = _valid_limit_at(rest, urest, i + 10)
+        if j == -1:
+            j = n
+        if j == i + 10:
+            return None
+        order = rest[i + 10:j]
+        i = j
+
+    if urest.startswith(' LIMIT ', i):
+        limit = rest[i + 7:]
+        if not limit.isdigit():
+            return None
+        i = n
+
+    if i != n:
+        return None
+    return where, order, limit
+
+
+def _convert_select(stmt, up):
+    f = up.find(' FROM ')
+    if f <= 7:
+        return None
+    fields = stmt[7:f]
+    table, i = _word(stmt, f + 6)
+    if not table:
+        return None
+    clauses = _split_clauses(stmt[i:], up[i:])
+    if clauses is None:
+        return None
+    where, order, limit = clauses
+    return {'op': 'find', 'collection': table, 'filter': where,
+            'projection': fields, 'sort': order, 'limit': limit}
+
+
+def _convert_join(stmt, up):
+    f = up.find(' FROM ')
+    if f <= 7:
+        return None
+    fields = stmt[7:f]
+    table, i = _word(stmt, f + 6)
+    if not table or not up.startswith(' A JOIN ', i):
+        return None
+    table2, i = _word(stmt, i + 8)
+    if not table2 or not up.startswith(' B ON A.', i):
+        return None
+    local, i = _word(stmt, i + 8)
+    if not local or not up.startswith(' = B.', i):
+        return None
+    foreign, i = _word(stmt, i + 5)
+    if not foreign:
+        return None
+    if i == len(stmt):
+        where = None
+    elif up.startswith(' WHERE ', i) and i + 7 < len(stmt):
+        where = stmt[i + 7:]
+    else:
+        return None
+    return {'op': 'join', 'collection': table, 'filter': where,
+            'projection': fields,
+            'join': {'from': table2, 'localField': local, 'foreignField': foreign}}
+
+
+def _convert_update(stmt, up):
+    table, i = _word(stmt, 7)
+    if not table or not up.startswith(' SET ', i):
+        return None
+    w = up.find(' WHERE ', i + 5)
+    if w == -1 or w == i + 5 or w + 7 >= len(stmt):
+        return None
+    return {'op': 'updateOne', 'collection': table,
+            'filter': stmt[w + 7:], 'update': stmt[i + 5:w]}
+
+
+def _convert_delete(stmt, up):
+    table, i = _word(stmt, 12)
+    if not table or not up.startswith(' WHERE ', i) or i + 7 >= len(stmt):
+        return None
+    return {'op': 'deleteOne', 'collection': table, 'filter': stmt[i + 7:]}
+
+
+def _convert_count_join(stmt, up):
+    p = stmt.find(')', 13)
+    if p <= 13 or not stmt.startswith(', ', p + 1):
+        return None
+    f = up.find(' FROM ', p + 3)
+    if f == -1 or f <= p + 2:
+        return None
+    table, i = _word(stmt, f + 6)
+    if not table or not up.startswith(' INNER JOIN ', i):
+        return None
+    table2, i = _word(stmt, i + 12)
+    if not table2 or not up.startswith(' ON ', i):
+        return None
+    eq = stmt.find(' = ', i + 4)
+    if eq == -1 or eq == i + 4:
+        return None
+    left = stmt[i + 4:eq]
+    g = up.find(' GROUP BY ', eq + 3)
+    if g == -1 or g == eq + 3:
+        return None
+    right = stmt[eq + 3:g]
+    o = up.find(' ORDER BY COUNT(', g + 10)
+    if o == -1 or o == g + 10:
+        return None
+    group_field = stmt[g + 10:o]
+    if not stmt.endswith(')') or len(stmt) - 1 <= o + 16:
+        return None
+    return {'op': 'count_join', 'collection': table, 'group': group_field,
+            'join': {'from': table2, 'localField': left.split('.')[1],
+                     'foreignField': right.split('.')[1]}}
+
+
+def _convert_statement(stmt):
+    """Parse one ';'-terminated statement body into a structured record,
+    or None to leave it as-is."""
+    if '\n' in stmt:  # single-line statements only, as before
+        return None
+    up = stmt.upper()
+    if up.startswith('SELECT '):
+        if up.startswith('SELECT COUNT('):
+            converted = _convert_count_join(stmt, up)
+            if converted is not None:
+                return converted
+        converted = _convert_select(stmt, up)
+        if converted is not None:
+            return converted
+        return _convert_join(stmt, up)
+    if up.startswith('UPDATE '):
+        return _convert_update(stmt, up)
+    if up.startswith('DELETE FROM '):
+        return _convert_delete(stmt, up)
+    return None
+
+
+_KEYWORDS = ('SELECT ', 'UPDATE ', 'DELETE FROM ')
+
+
+def _statement_start(chunk):
+    """Offset of the first statement keyword in the chunk, or -1."""
+    up = chunk.upper()
+    best = -1
+    for keyword in _KEYWORDS:
+        p = up.find(keyword)
+        if p != -1 and (best == -1 or p < best):
+            best = p
+    return best
+
+
+def _statement_table(stmt, up):
+    """Table a statement targets, scanned without converting it."""
+    if up.startswith('SELECT '):
+        f = up.find(' FROM ')
+        if f == -1:
+            return None
+        return _word(stmt, f + 6)[0] or None
+    if up.startswith('UPDATE '):
+        return _word(stmt, 7)[0] or None
+    if up.startswith('DELETE FROM '):
+        return _word(stmt, 12)[0] or None
+    return None
+
+
+def _convert_sql(sql, table_set, pretty):
+    # Linear keyword scan instead of a regex cascade: split on ';', find
+    # the statement keyword, and pull each clause out by index. Anything
+    # that does not decompose cleanly is passed through untouched.
+    out = []
+    i = 0
+    while True:
+        end = sql.find(';', i)
+        if end == -1:
+            out.append(sql[i:])
+            return ''.join(out)
+        chunk = sql[i:end]
+        start = _statement_start(chunk)
+        record = None
+        if start != -1:
+            stmt = chunk[start:]
+            if table_set is None or _statement_table(stmt, stmt.upper()) in table_set:
+                record = _convert_statement(stmt)
+        if record is None:
+            out.append(sql[i:end + 1])
+        else:
+            out.append(chunk[:start])
+            out.append(render_shell(record, pretty))
+        i = end + 1
+
+
+def _render_aggregate(collection, stages, pretty):
+    if pretty:
+        return f'db.{collection}.aggregate([\n  ' + ',\n  '.join(stages) + '\n])'
+    return f'db.{collection}.aggregate([' + ', '.join(stages) + '])'
+
+
+def render_shell(record, pretty=False):
+    """Renders a statement record into MongoDB shell syntax.
+
+    Formatting happens only here, at the sink; everything upstream
+    passes the structured record around. With pretty=True, multi-part
+    outputs spread over indented lines (the old dynamic2 style)."""
+    collection = record['collection']
+    op = record['op']
+    if op == 'find':
+        head = f'{{ {convert_where_clause(record["filter"], pretty)} }}'
+        proj = f'{{ {convert_select_fields(record["projection"])} }}'
+        tail = f'{convert_order_by(record["sort"], pretty)}{convert_limit(record["limit"], pretty)}'
+        if pretty:
+            return f'db.{collection}.find(\n  {head},\n  {proj}\n){tail}'
+        return f'db.{collection}.find({head}, {proj}){tail}'
+    if op == 'join':
+        join = record['join']
+        return _render_aggregate(collection, (
+            f'{{ $match: {{ {convert_where_clause(record["filter"], pretty)} }} }}',
+            f'{{ $lookup: {{ from: "{join["from"]}", localField: "{join["localField"]}", foreignField: "{join["foreignField"]}", as: "joined_docs" }} }}',
+            '{ $unwind: "$joined_docs" }',
+            f'{{ $project: {{ {convert_select_fields(record["projection"])} }} }}',
+        ), pretty)
+    if op == 'count_join':
+        join = record['join']
+        return _render_aggregate(collection, (
+            f'{{ $lookup: {{ from: "{join["from"]}", localField: "{join["localField"]}", foreignField: "{join["foreignField"]}", as: "joined_docs" }} }}',
+            '{ $unwind: "$joined_docs" }',
+            f'{{ $group: {{ _id: "${record["group"]}", count: {{ $sum: 1 }} }} }}',
+            '{ $sort: { count: -1 } }',
+        ), pretty)
+    if op == 'updateOne':
+        return f'db.{collection}.updateOne({{ {convert_where_clause(record["filter"], pretty)} }}, {{ $set: {{ {convert_update_fields(record["update"])} }} }})'
+    return f'db.{collection}.deleteOne({{ {convert_where_clause(record["filter"], pretty)} }})'
+
+
+def convert_sql_to_records(sql):
+    """Converts each ';'-terminated statement into its structured record.
+
+    Returns a list of (statement_text, record) pairs, record being None
+    for statements the converter does not understand. Consumers that
+    execute operations work off the records directly instead of
+    re-parsing rendered shell strings."""
+    pairs = []
+    i = 0
+    n = len(sql)
+    while i < n:
+        end = sql.find(';', i)
+        if end == -1:
+            end = n
+        chunk = sql[i:end]
+        start = _statement_start(chunk)
+        stmt = chunk[start:] if start != -1 else chunk
+        if stmt.strip():
+            pairs.append((stmt, _convert_statement(stmt) if start != -1 else None))
+        i = end + 1
+    return pairs
+
+
+def convert_sql_to_mongo(sql, pretty=False):
+    return _convert_sql(sql, None, pretty)
+
+
+def make_converter(tables, pretty=False):
+    """Partially evaluates the converter for a fixed table set.
+
+    The returned function behaves like convert_sql_to_mongo, except a
+    statement whose table falls outside `tables` short-circuits on one
+    cheap table scan -- no clause parsing, no output building -- and
+    passes through unchanged. Bind once per schema, call many times."""
+    table_set = frozenset(tables)
+
+    def convert(sql):
+        return _convert_sql(sql, table_set, pretty)
+
+    return convert
+
+# Single-char substitution table for the WHERE rewrite; translate walks
+# the string once in C instead of replace's substring search
+_EQ_TRANS = str.maketrans({'=': ':'})
+
+def convert_where_clause(where_clause, pretty=False):
     if not where_clause:
         return ''
-    # Convert SQL WHERE clause to MongoDB query
-    where_clause = where_clause.replace('=', ':')
-    where_clause = where_clause.replace(' AND ', ', ')
-    return where_clause
+    # Convert SQL WHERE clause to MongoDB query; the pretty dialect
+    # (formerly dynamic2) spells the separator ': ' rather than ':'
+    if pretty:
+        return where_clause.replace('=', ': ').replace(' AND ', ', ')
+    return where_clause.translate(_EQ_TRANS).replace(' AND ', ', ')
+
+@_maybe_jit
+def _field_end(s, start):
+    """Index one past the comma-separated field starting at `start`."""
+    end = s.find(',', start)
+    return len(s) if end == -1 else end
+
+
+@_maybe_jit
+def _projection_fields(select_fields):
+    parts = []
+    start = 0
+    n = len(select_fields)
+    while True:
+        end = _field_end(select_fields, start)
+        parts.append('"' + select_fields[start:end].strip() + '": 1')
+        if end == n:
+            return ', '.join(parts)
+        start = end + 1
+
+
+@_maybe_jit
+def _update_pairs(update_fields):
+    parts = []
+    start = 0
+    n = len(update_fields)
+    while True:
+        end = _field_end(update_fields, start)
+        field = update_fields[start:end]
+        eq = field.find('=')
+        if eq == -1:
+            raise IndexError('update field without "="')
+        # second '=' bounds the value, matching split('=')[1]
+        stop = field.find('=', eq + 1)
+        if stop == -1:
+            stop = len(field)
+        parts.append('"' + field[:eq].strip() + '": ' + field[eq + 1:stop].strip())
+        if end == n:
+            return ', '.join(parts)
+        start = end + 1
+
+
+# Direction tokens decoded by table lookup: the common spellings hit
+# without the .upper() allocation, anything else is uppercased once on
+# the retry probe so mixed case stays case-insensitive like every other
+# keyword here. A missing direction defaults to ascending, SQL's own
+# default; a present-but-unrecognized token sorts descending, as the
+# old ASC-compare did. Plain Python (not _maybe_jit): nopython mode
+# cannot read a module-level dict.
+_DIR = {'ASC': '1', 'asc': '1', 'DESC': '-1', 'desc': '-1', '': '1'}
+
+
+def _sort_fields(order_by_clause):
+    parts = []
+    for field in order_by_clause.split(','):
+        tokens = field.split()
+        tok = tokens[1] if len(tokens) > 1 else ''
+        direction = _DIR.get(tok) or _DIR.get(tok.upper(), '-1')
+        parts.append('"' + tokens[0] + '": ' + direction)
+    return ', '.join(parts)
+
 
 def convert_select_fields(select_fields):
     # Convert SQL SELECT fields to MongoDB projection
-    fields = select_fields.split(',')
-    return ', '.join([f'"{field.strip()}": 1' for field in fields])
+    return _projection_fields(select_fields)
+
+@_maybe_jit
+def _document_pairs(columns, values):
+    """Pairs columns with values positionally, like zip over the split
+    lists but in one scan: extra values are ignored, running out of
+    values raises IndexError."""
+    parts = []
+    cstart = 0
+    vstart = 0
+    ncols = len(columns)
+    nvals = len(values)
+    while True:
+        cend = _field_end(columns, cstart)
+        if vstart > nvals:
+            raise IndexError('fewer values than columns')
+        vend = _field_end(values, vstart)
+        parts.append('"' + columns[cstart:cend].strip() + '": ' + values[vstart:vend].strip())
+        if cend == ncols:
+            return ', '.join(parts)
+        cstart = cend + 1
+        vstart = vend + 1
+
 
 def convert_insert_fields(columns, values):
     # Convert SQL INSERT fields to MongoDB document
-    columns = columns.split(',')
-    values = values.split(',')
-    return ', '.join([f'"{columns[i].strip()}": {values[i].strip()}' for i in range(len(columns))])
+    return _document_pairs(columns, values)
 
 def convert_update_fields(update_fields):
     # Convert SQL UPDATE fields to MongoDB update document
-    fields = update_fields.split(',')
-    return ', '.join([f'"{field.split("=")[0].strip()}": {field.split("=")[1].strip()}' for field in fields])
+    return _update_pairs(update_fields)
 
-def convert_order_by(order_by_clause):
+def convert_order_by(order_by_clause, pretty=False):
     if not order_by_clause:
         return ''
     # Convert SQL ORDER BY clause to MongoDB sort
-    fields = order_by_clause.split(',')
-    sort_fields = ', '.join([f'"{field.strip().split()[0]}": {1 if field.strip().split()[1].upper() == "ASC" else -1}' for field in fields])
-    return f'.sort({{{sort_fields}}})'
+    prefix = '\n' if pretty else ''
+    return f'{prefix}.sort({{{_sort_fields(order_by_clause)}}})'
 
-def convert_limit(limit_clause):
+def convert_limit(limit_clause, pretty=False):
     if not limit_clause:
         return ''
     # Convert SQL LIMIT clause to MongoDB limit
-    return f'.limit({limit_clause})'
+    prefix = '\n' if pretty else ''
+    return f'{prefix}.limit({limit_clause})'
 
 # Example SQL commands
 sql_commands = [
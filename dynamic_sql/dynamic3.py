@@ -1,92 +1,182 @@
+import functools
+import types
+
 import sqlparse
 import re
 
+_COND_RE = re.compile(r'(\w+)\s*(=|>|<|>=|<=|!=)\s*(["\']?.*?["\']?)\s*(AND|OR)?')
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+_IDENT_RE = re.compile(r'\w+')
+
+
+@functools.lru_cache(maxsize=256)
+def _like_to_regex(value):
+    """Translates SQL LIKE wildcards to their regex spelling, memoized
+    so repeated LIKE patterns pay for the rewrite once."""
+    return value.replace('%', '.*')
+
 class SQLToMongoConverter:
-    def __init__(self):
-        self.operators_map = {
-            '=': '$eq',
-            '!=': '$ne',
-            '>': '$gt',
-            '>=': '$gte',
-            '<': '$lt',
-            '<=': '$lte',
-            'LIKE': '$regex',
-            'IN': '$in',
-            'NOT IN': '$nin'
-        }
+    # The converter carries no per-instance state, so the operator map
+    # lives on the class and the methods are staticmethods; that lets
+    # convert() memoize whole conversions across instances. Empty
+    # __slots__ drops the per-instance __dict__ entirely, and the
+    # mapping proxy keeps the shared map read-only.
+    __slots__ = ()
+
+    operators_map = types.MappingProxyType({
+        '=': '$eq',
+        '!=': '$ne',
+        '>': '$gt',
+        '>=': '$gte',
+        '<': '$lt',
+        '<=': '$lte',
+        'LIKE': '$regex',
+        'IN': '$in',
+        'NOT IN': '$nin'
+    })
 
-    def convert_where_clause(self, where_clause):
+    @staticmethod
+    def convert_where_clause(where_clause):
         if not where_clause:
             return {}
 
         # More sophisticated where clause parsing
         conditions = {}
         
-        # Basic parsing of simple conditions
-        for condition in re.findall(r'(\w+)\s*(=|>|<|>=|<=|!=)\s*(["\']?.*?["\']?)\s*(AND|OR)?', where_clause):
-            field, operator, value, logical_op = condition
-            
+        # Basic parsing of simple conditions; finditer streams matches
+        # instead of materializing the full tuple list up front
+        for match in _COND_RE.finditer(where_clause):
+            field = match.group(1)
+            operator = match.group(2)
+
             # Remove quotes if present
-            value = value.strip("'\"")
+            value = match.group(3).strip("'\"")
             
-            # Handle type conversion
-            try:
-                value = int(value)
-            except ValueError:
-                try:
-                    value = float(value)
-                except ValueError:
-                    pass
-
-            # Convert operator
-            mongo_op = self.operators_map.get(operator, operator)
+            # Handle type conversion: one fullmatch classifies the value
+            # instead of raising through int() then float() on every
+            # string value (the common case)
+            if _NUM_RE.fullmatch(value):
+                value = float(value) if '.' in value else int(value)
+
+            # Convert operator; every operator the pattern can match has
+            # a mapping, so index directly instead of .get with a default
+            mongo_op = SQLToMongoConverter.operators_map[operator]
             
             if mongo_op == '$regex':
                 # Handle LIKE with basic wildcard conversion
-                value = value.replace('%', '.*')
+                value = _like_to_regex(value)
 
             conditions[field] = {mongo_op: value}
 
         return conditions
 
-    def convert_select(self, parsed_sql):
-        # Extract key components from parsed SQL
-        tables = [token.value for token in parsed_sql.tokens if isinstance(token, sqlparse.sql.Identifier) and token.ttype is None]
-        
-        # Handle projection
-        select_tokens = [token for token in parsed_sql.tokens if isinstance(token, sqlparse.sql.IdentifierList)]
+    @staticmethod
+    def convert_select(parsed_sql):
+        # One pass over the token stream, classifying each token into its
+        # bucket, instead of three separate walks with isinstance checks
+        tables = []
         projections = {}
-        if select_tokens:
-            for item in select_tokens[0].tokens:
+        select_list = None
+        where_token = None
+        for token in parsed_sql.tokens:
+            if isinstance(token, sqlparse.sql.Where):
+                where_token = token
+            elif isinstance(token, sqlparse.sql.IdentifierList):
+                if select_list is None:
+                    select_list = token
+            elif isinstance(token, sqlparse.sql.Identifier) and token.ttype is None:
+                tables.append(token.value)
+
+        if select_list is not None:
+            for item in select_list.tokens:
                 if isinstance(item, sqlparse.sql.Identifier):
                     projections[item.value] = 1
 
-        # Handle WHERE clause
+        # The WHERE body is everything after the leading keyword token;
+        # slicing the subtokens avoids re-stringifying the whole clause
         where_clause = None
-        for token in parsed_sql.tokens:
-            if isinstance(token, sqlparse.sql.Where):
-                where_clause = str(token).replace('WHERE', '').strip()
+        if where_token is not None:
+            where_clause = ''.join(t.value for t in where_token.tokens[1:]).strip()
 
         # Construct MongoDB query
         query = {
             'collection': tables[0],
             'find_params': {
-                'filter': self.convert_where_clause(where_clause) if where_clause else {},
+                'filter': SQLToMongoConverter.convert_where_clause(where_clause) if where_clause else {},
                 'projection': projections if projections else None
             }
         }
 
         return query
 
-    def convert(self, sql_query):
-        # Parse the SQL query
-        parsed = sqlparse.parse(sql_query)[0]
-        
-        # Determine query type and convert
-        if parsed.get_type() == 'SELECT':
-            return self.convert_select(parsed)
-        
+    @staticmethod
+    def convert(sql_query):
+        return _convert_cached(sql_query)
+
+
+def _fast_select_parse(sql_query):
+    """Hand-rolled parse of plain SELECT field-list/table/WHERE queries.
+
+    Slices the three segments out with str.find instead of building a
+    sqlparse token tree. Returns the same query dict convert_select
+    would, including its quirk of treating a lone projection identifier
+    as the collection; anything fancier (aliases, dotted names, ORDER
+    BY, joins) returns None so the sqlparse path decides."""
+    s = sql_query.strip()
+    up = s.upper()
+    if not up.startswith('SELECT '):
         return None
+    f = up.find(' FROM ')
+    if f <= 7:
+        return None
+    fields = s[7:f].strip()
+    rest = s[f + 6:]
+    w = up[f + 6:].find(' WHERE ')
+    if w == -1:
+        table = rest.strip()
+        where_clause = None
+    else:
+        table = rest[:w].strip()
+        where_clause = rest[w + 7:].strip()
+    if not _IDENT_RE.fullmatch(table):
+        return None
+
+    projections = {}
+    collection = table
+    if fields != '*':
+        items = [field.strip() for field in fields.split(',')]
+        if not all(_IDENT_RE.fullmatch(item) for item in items):
+            return None
+        if len(items) == 1:
+            collection = items[0]
+        else:
+            projections = {item: 1 for item in items}
+
+    return {
+        'collection': collection,
+        'find_params': {
+            'filter': SQLToMongoConverter.convert_where_clause(where_clause) if where_clause else {},
+            'projection': projections if projections else None
+        }
+    }
+
+
+@functools.lru_cache(maxsize=1024)
+def _convert_cached(sql_query):
+    # Memoized on the SQL text: repeated queries (common in batch ETL)
+    # skip the sqlparse lexer entirely. Hits hand back the same dict, so
+    # callers must treat the result as read-only.
+    query = _fast_select_parse(sql_query)
+    if query is not None:
+        return query
+
+    parsed = sqlparse.parse(sql_query)[0]
+
+    # Determine query type and convert
+    if parsed.get_type() == 'SELECT':
+        return SQLToMongoConverter.convert_select(parsed)
+
+    return None
 
 # Example usage
 converter = SQLToMongoConverter()
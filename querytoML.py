@@ -1,3 +1,5 @@
+import sys
+
 import requests
 from requests.auth import HTTPDigestAuth
 
@@ -23,26 +25,40 @@ headers = {
     "Accept": "application/xml"
 }
 
-# Digest Authentication
-auth = HTTPDigestAuth(username, password)
+# One session for the process: the TCP connection is pooled and the
+# digest challenge state is cached, so each query after the first is a
+# single round trip instead of a fresh handshake
+session = requests.Session()
+session.auth = HTTPDigestAuth(username, password)
+session.headers.update(headers)
+
+
+def run_xquery(xq):
+    """Evaluates one XQuery body against the REST endpoint, reusing the
+    pooled session connection."""
+    try:
+        with session.post(eval_url, data={"xquery": xq}, stream=True) as response:
+            response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
+
+            if response.status_code == 200:
+                print("XQuery executed successfully.")
+                print("Response:")
+                # Stream the body straight to stdout in 64 KiB chunks
+                # rather than decoding it all into one str first
+                out = sys.stdout
+                out.flush()
+                for chunk in response.iter_content(chunk_size=65536):
+                    out.buffer.write(chunk)
+                out.buffer.write(b"\n")
+                out.buffer.flush()
+            else:
+                print(f"Failed to execute XQuery. Status code: {response.status_code}")
+                print(response.text)
+    except requests.exceptions.RequestException as e:
+        print(f"An error occurred: {e}")
+        if e.response is not None:
+            print(f"Response content: {e.response.content}")
 
-# Define the payload for the request
-data = {
-    "xquery": xquery_statement
-}
 
-try:
-    response = requests.post(eval_url, headers=headers, data=data, auth=auth)
-    response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
-
-    if response.status_code == 200:
-        print("XQuery executed successfully.")
-        print("Response:")
-        print(response.text)
-    else:
-        print(f"Failed to execute XQuery. Status code: {response.status_code}")
-        print(response.text)
-except requests.exceptions.RequestException as e:
-    print(f"An error occurred: {e}")
-    if e.response is not None:
-        print(f"Response content: {e.response.content}")
+if __name__ == "__main__":
+    run_xquery(xquery_statement)
@@ -0,0 +1,10 @@
+# Builds the optional Cython accelerators. The scripts all run without
+# them; build in place to enable:
+#   python setup.py build_ext --inplace
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='ml2mongo-accel',
+    ext_modules=cythonize(['xquery_convert.pyx', 'conversion_core.pyx']),
+)
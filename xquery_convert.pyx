@@ -0,0 +1,48 @@
+# cython: language_level=3
+# Optional C-compiled fast path for TEMP2.convert_xquery_to_mongodb.
+# Build in place with: python setup.py build_ext --inplace
+# Returns None for inputs the fast path cannot handle (unknown prefix or
+# malformed argument list) so the pure-Python fallback can take over.
+
+cdef tuple _args(str s, Py_ssize_t start):
+    cdef Py_ssize_t q1, q2, comma, end
+    q1 = s.find('"', start)
+    if q1 == -1:
+        return None
+    q2 = s.find('"', q1 + 1)
+    if q2 == -1:
+        return None
+    comma = s.find(',', q2 + 1)
+    end = s.rfind(')')
+    # no closing paren after the id (or it precedes the comma): hand the
+    # command to the Python fallback, which rejects it
+    if end < q2 or end < comma:
+        return None
+    if comma == -1:
+        return (s[q1 + 1:q2], None)
+    return (s[q1 + 1:q2], s[comma + 1:end].strip())
+
+
+cpdef convert(str s):
+    cdef tuple a
+    if s.startswith('fn:doc('):
+        a = _args(s, 7)
+        if a is None:
+            return None
+        return ('findOne', {'_id': a[0]})
+    if s.startswith('xdmp:document-insert('):
+        a = _args(s, 21)
+        if a is None or a[1] is None:
+            return None
+        return ('insertOne', {'_id': a[0], 'data': a[1]})
+    if s.startswith('xdmp:node-replace('):
+        a = _args(s, 18)
+        if a is None or a[1] is None:
+            return None
+        return ('updateOne', {'_id': a[0]}, {'$set': a[1]})
+    if s.startswith('xdmp:document-delete('):
+        a = _args(s, 21)
+        if a is None:
+            return None
+        return ('deleteOne', {'_id': a[0]})
+    return None
@@ -1,6 +1,14 @@
+import json
+
 import pymongo
 import re
 
+# CRUD patterns compiled once at import
+_INSERT_RE = re.compile(r'xdmp:document-insert\("(.+?)", (.+)\)')
+_GET_RE = re.compile(r'xdmp:document-get\("(.+?)"\)')
+_REPLACE_RE = re.compile(r'xdmp:node-replace\(doc\("(.+?)"\)//(.+?), (.+)\)')
+_DELETE_RE = re.compile(r'xdmp:document-delete\("(.+?)"\)')
+
 def connect_mongo(uri="mongodb://localhost:27017/", db_name="testDB", collection_name="testCollection"):
     """Connects to MongoDB and returns a collection handle."""
     client = pymongo.MongoClient(uri)
@@ -11,59 +19,89 @@ def convert_xquery_to_mongo(xquery):
     """Converts MarkLogic XQuery CRUD operations to MongoDB equivalents."""
     if "xdmp:document-insert" in xquery:
         # Create: Insert Document
-        match = re.search(r'xdmp:document-insert\("(.+?)", (.+)\)', xquery)
+        match = _INSERT_RE.search(xquery)
         if match:
             doc_id = match.group(1)
-            document = eval(match.group(2))  # Converts XML-like string to dict (simplified parsing)
+            document = json.loads(match.group(2))  # One C parser pass; no compile/exec of untrusted text
             document["_id"] = doc_id  # Store the document ID
             return {"operation": "insert", "data": document}
     
     elif "xdmp:document-get" in xquery:
         # Read: Find Document
-        match = re.search(r'xdmp:document-get\("(.+?)"\)', xquery)
+        match = _GET_RE.search(xquery)
         if match:
             doc_id = match.group(1)
             return {"operation": "find", "query": {"_id": doc_id}}
     
     elif "xdmp:node-replace" in xquery:
         # Update: Replace Field
-        match = re.search(r'xdmp:node-replace\(doc\("(.+?)"\)//(.+?), (.+)\)', xquery)
+        match = _REPLACE_RE.search(xquery)
         if match:
             doc_id = match.group(1)
             field = match.group(2)
-            new_value = eval(match.group(3))
+            new_value = json.loads(match.group(3))
             return {"operation": "update", "query": {"_id": doc_id}, "update": {"$set": {field: new_value}}}
     
     elif "xdmp:document-delete" in xquery:
         # Delete: Remove Document
-        match = re.search(r'xdmp:document-delete\("(.+?)"\)', xquery)
+        match = _DELETE_RE.search(xquery)
         if match:
             doc_id = match.group(1)
             return {"operation": "delete", "query": {"_id": doc_id}}
     
     return {"error": "Unsupported XQuery statement"}
 
+def execute_mongo_batch(mongo_collection, mongo_queries):
+    """Executes a list of converted operations with one write round trip.
+
+    Inserts, updates and deletes are combined into a single unordered
+    bulk_write; finds (which bulk_write cannot carry) and unsupported
+    entries are answered inline, in input order. Returns a tuple of the
+    BulkWriteResult (None when the batch held no writes) and the list
+    of read results."""
+    ops = []
+    reads = []
+
+    for mongo_query in mongo_queries:
+        operation = mongo_query.get("operation")
+
+        if operation == "insert":
+            ops.append(pymongo.InsertOne(mongo_query["data"]))
+
+        elif operation == "find":
+            document = mongo_collection.find_one(mongo_query["query"])
+            reads.append(document if document else "Document not found")
+
+        elif operation == "update":
+            ops.append(pymongo.UpdateOne(mongo_query["query"], mongo_query["update"]))
+
+        elif operation == "delete":
+            ops.append(pymongo.DeleteOne(mongo_query["query"]))
+
+        else:
+            reads.append("Invalid operation")
+
+    result = mongo_collection.bulk_write(ops, ordered=False) if ops else None
+    return result, reads
+
 def execute_mongo_query(mongo_collection, mongo_query):
-    """Executes the MongoDB equivalent operation."""
+    """Executes the MongoDB equivalent operation (a one-element batch)."""
     operation = mongo_query.get("operation")
-    
+    result, reads = execute_mongo_batch(mongo_collection, [mongo_query])
+
     if operation == "insert":
-        result = mongo_collection.insert_one(mongo_query["data"])
-        return f"Inserted Document with ID: {result.inserted_id}"
-    
+        return f"Inserted Document with ID: {mongo_query['data'].get('_id')}"
+
     elif operation == "find":
-        document = mongo_collection.find_one(mongo_query["query"])
-        return document if document else "Document not found"
-    
+        return reads[0]
+
     elif operation == "update":
-        result = mongo_collection.update_one(mongo_query["query"], mongo_query["update"])
         return f"Updated {result.modified_count} document(s)"
-    
+
     elif operation == "delete":
-        result = mongo_collection.delete_one(mongo_query["query"])
         return f"Deleted {result.deleted_count} document(s)"
-    
-    return "Invalid operation"
+
+    return reads[0]
 
 if __name__ == "__main__":
     # Example XQuery statement (Change this to test different CRUD operations)